@@ -5,11 +5,8 @@ class LarkTransformer(Transformer):
     if n==m==o (e.g., aaabbbccc) and NO otherwise (e.g., aaaabcc).
     """""
     def start(self,children):
-        print(children)
-        a_sequence_length = children[0]
-        b_sequence_length = children[1]
-        c_sequence_length = children[2]
-        if a_sequence_length == b_sequence_length and b_sequence_length == c_sequence_length:
+        a_sequence_length, b_sequence_length, c_sequence_length = children
+        if a_sequence_length == b_sequence_length == c_sequence_length:
             return "YES"
         else:
             return "NO"
@@ -17,9 +14,6 @@ class LarkTransformer(Transformer):
     def a_rule(self,children):
         return len(children)
 
-    def b_rule(self,children):
-        return len(children)
-
-    def c_rule(self,children):
-        return len(children)
+    b_rule = a_rule
+    c_rule = a_rule
 
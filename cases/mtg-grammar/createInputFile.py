@@ -1,30 +1,44 @@
-import json
+import functools
+import re
+
+import orjson
+
+@functools.lru_cache(maxsize=None)
+def nameSubstitution(name):
+    # Full name first so it wins over its own prefix at the same position.
+    if "," in name:
+        splitName = name.split(",")
+        replacements = {name: "~f", splitName[0]: "~"}
+    else:
+        replacements = {name: "~"}
+    pattern = re.compile("|".join(map(re.escape, replacements)))
+    # Every replacement starts with the part of the name before the first comma
+    prefix = name.split(",")[0]
+    return prefix, pattern, replacements
 
 def cleanUpCardText(card):
     text = card["text"]
     name = card["name"]
     if name is not None:
-        if "," in name:
-            splitName = name.split(",")
-            text = text.replace(name, "~f")
-            text = text.replace(splitName[0], "~")
-        else:
-            text = text.replace(name, "~")
+        prefix, pattern, replacements = nameSubstitution(name)
+        if prefix in text:
+            text = pattern.sub(lambda match: replacements[match.group(0)], text)
     return f'"""{text}"""\n'
 
 
 def extract_english_card_text(json_path, output_path="inputs.txt"):
-    with open(json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(json_path, "rb") as f:
+        data = orjson.loads(f.read())
+
+    cards = (data.get("data") or {}).get("cards") or []
 
-    cards = data.get("data", []).get("cards",[])
+    chunks = []
+    for card in cards:
+        if card.get("language") == "English" and "text" in card:
+            chunks.append(cleanUpCardText(card))
 
-    with open(output_path, "w", encoding="utf-8") as out:
-        for card in cards:
-            if card.get("language") == "English" and "text" in card:
-                cardTextOutput = cleanUpCardText(card)
-                print(cardTextOutput)
-                out.write(cardTextOutput)
+    with open(output_path, "wb") as out:
+        out.write("".join(chunks).encode("utf-8"))
 
 # Usage
-extract_english_card_text("FDN.json")
\ No newline at end of file
+extract_english_card_text("FDN.json")
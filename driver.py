@@ -1,16 +1,77 @@
 import argparse
+import functools
 import importlib
+import inspect
 import re
 import multiprocessing
+import sys
 import time
 import os
-from multiprocessing import Pool, Manager, Value
+from collections.abc import Iterator
 from lark import Lark, UnexpectedInput
 
 def load_grammar(grammar_path: str) -> str:
+    # Keyed on the modification time so that an edited grammar is read again
+    return _read_grammar(grammar_path, os.path.getmtime(grammar_path))
+
+@functools.lru_cache(maxsize=16)
+def _read_grammar(grammar_path: str, mtime: float) -> str:
     with open(grammar_path, 'r', encoding='utf-8') as file:
         return file.read()
 
+# Matches a single triple-quoted block; pairs are recovered from the gap between blocks
+_QUOTES = '"""'
+_BLOCK_RE = re.compile(r'"""(.*?)"""', re.DOTALL)
+_PAIR_SEPARATOR_RE = re.compile(r'\s*,\s*')
+_READ_CHUNK_SIZE = 1 << 16
+# Lark error messages list the expected tokens after this marker
+_EXPECTED_MARKER = "Expected one of:"
+
+def iter_inputs_and_targets_from_file(file_path: str) -> Iterator[tuple[str, str | None]]:
+    """
+    Lazily yields records from a file where each record is enclosed in triple quotes.
+
+    The file is read in fixed-size chunks and only the text after the last complete block
+    is kept between reads, so memory use is bounded by the longest record rather than the file.
+
+    Yields:
+        Tuples: (input_string, output_string or None)
+    """
+    pending_input = None  # Last block seen, which may still be the input half of a pair
+    buffer = ""
+    opener = -1  # Position in buffer of the unclosed opening quotes, or -1 if none has been seen
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for chunk in iter(lambda: file.read(_READ_CHUNK_SIZE), ""):
+            # Quotes split across the chunk boundary start at most two characters before the new text
+            search_from = max(0, len(buffer) - 2)
+            buffer += chunk
+            # Only the new text is searched for delimiters, so a long record is not rescanned for every chunk
+            if opener == -1:
+                opener = buffer.find(_QUOTES, search_from)
+                if opener == -1:
+                    continue
+            if buffer.find(_QUOTES, max(opener + len(_QUOTES), search_from)) == -1:
+                continue
+
+            consumed = 0
+            for match in _BLOCK_RE.finditer(buffer, opener):
+                block = match.group(1).strip()
+                if pending_input is None:
+                    pending_input = block
+                # Two blocks separated only by a comma form an input/output pair
+                elif _PAIR_SEPARATOR_RE.fullmatch(buffer, consumed, match.start()):
+                    yield pending_input, block
+                    pending_input = None
+                else:
+                    yield pending_input, None
+                    pending_input = block
+                consumed = match.end()
+            buffer = buffer[consumed:]
+            opener = buffer.find(_QUOTES)
+
+    if pending_input is not None:
+        yield pending_input, None
+
 def extract_inputs_and_targets_from_file(file_path: str) -> list[tuple[str, str | None]]:
     """
     Extracts inputs (and optionally targets) from a file where each record is enclosed in triple quotes.
@@ -21,32 +82,15 @@ def extract_inputs_and_targets_from_file(file_path: str) -> list[tuple[str, str
     Returns:
         List of tuples: (input_string, output_string or None)
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-
-    # Matches pairs: """...""","""...""" OR single: """..."""
-    pattern = re.compile(
-        r'"""(.*?)"""\s*,\s*"""(.*?)"""|'   # Input/output pair
-        r'"""(.*?)"""',                    # Or single input
-        re.DOTALL
-    )
-
-    results = []
-    for match in pattern.finditer(content):
-        if match.group(1) and match.group(2):
-            input_str = match.group(1).strip()
-            output_str = match.group(2).strip()
-            results.append((input_str, output_str))
-        else:
-            input_str = match.group(3).strip()
-            results.append((input_str, None))
-
-    return results
+    return list(iter_inputs_and_targets_from_file(file_path))
 
 
+@functools.lru_cache(maxsize=None)
 def load_transformer(import_path: str):
     """
     Dynamically imports a transformer class from the given module path.
+    The instance is memoized per path, so the parser main builds with an embedded transformer
+    is the same build_parser cache entry that initialize_worker looks up.
 
     Args:
         import_path (str): The dot-separated import path (e.g., "cases.morse.transformer").
@@ -60,28 +104,107 @@ def load_transformer(import_path: str):
     except (ModuleNotFoundError, AttributeError) as e:
         raise ImportError(f"Could not import/instantiate Transformer from '{import_path}': {e}")
 
+def build_parser(grammar_text, start_rule, parser_type, ambiguity_mode, cache_path, transformer=None):
+    """
+    Construct the Lark parser used by the driver and its workers.
+    Parsers are memoized on their arguments, so a worker in the main process or forked from it
+    reuses the parser main already built instead of analyzing the grammar again.
+
+    Args:
+        cache_path: File to cache the LALR analysis in, or None to disable caching.
+        transformer: Transformer to apply during parsing (LALR only), or None to return parse trees.
+    """
+    # lru_cache keys keyword and positional arguments differently, so always pass them positionally
+    return _build_parser(grammar_text, start_rule, parser_type, ambiguity_mode, cache_path, transformer)
+
+@functools.lru_cache(maxsize=16)
+def _build_parser(grammar_text, start_rule, parser_type, ambiguity_mode, cache_path, transformer):
+    lark_kwargs = dict(start=start_rule, parser=parser_type, maybe_placeholders=False)
+    if ambiguity_mode:
+        lark_kwargs["ambiguity"] = "explicit"
+    if cache_path:
+        lark_kwargs["cache"] = cache_path
+    if transformer is not None:
+        lark_kwargs["transformer"] = transformer
+    return Lark(grammar_text, **lark_kwargs)
+
+# Below this many inputs the driver parses in the main process instead of starting a pool
+_SERIAL_THRESHOLD = 4
+
 # Global variables for multiprocessing
-_GRAMMAR_TEXT = None
-_START_RULE = None
-_PARSER_TYPE = None
-_TRANSFORMER_PATH = None
+_PARSER = None
+_PARSER_ERROR = None
+_TRANSFORMER = None
+_TRANSFORMER_ERROR = None
+_EMBED_TRANSFORMER = None
 _AMBIGUITY_MODE = None
-_COUNTER = None
-_TOTAL = None
+_VERBOSE = None
 
-def initialize_worker(grammar_text, start_rule, parser_type, transformer_path, ambiguity_mode, counter, total):
+def initialize_worker(grammar_text, start_rule, parser_type, transformer_path, ambiguity_mode, cache_path, embed_transformer, verbose):
     """
     Initialize the worker process with the grammar and transformer.
-    This function sets global variables that will be used by process_input.
+    The parser and transformer are built once here and reused by every call to process_input;
+    construction errors are stored so that process_input can report them per input.
     """
-    global _GRAMMAR_TEXT, _START_RULE, _PARSER_TYPE, _TRANSFORMER_PATH, _AMBIGUITY_MODE, _COUNTER, _TOTAL
-    _GRAMMAR_TEXT = grammar_text
-    _START_RULE = start_rule
-    _PARSER_TYPE = parser_type
-    _TRANSFORMER_PATH = transformer_path
+    global _PARSER, _PARSER_ERROR, _TRANSFORMER, _TRANSFORMER_ERROR, _EMBED_TRANSFORMER, _AMBIGUITY_MODE, _VERBOSE
+    _EMBED_TRANSFORMER = embed_transformer
     _AMBIGUITY_MODE = ambiguity_mode
-    _COUNTER = counter
-    _TOTAL = total
+    _VERBOSE = verbose
+
+    _TRANSFORMER = None
+    _TRANSFORMER_ERROR = None
+    if transformer_path:
+        try:
+            _TRANSFORMER = load_transformer(transformer_path)
+        except Exception as e:
+            _TRANSFORMER_ERROR = f"Transformer initialization error: {str(e)}"
+
+    _PARSER = None
+    _PARSER_ERROR = None
+    try:
+        _PARSER = build_parser(grammar_text, start_rule, parser_type, ambiguity_mode, cache_path,
+                               transformer=_TRANSFORMER if embed_transformer else None)
+    except Exception as e:
+        _PARSER_ERROR = f"Parser initialization error: {str(e)}"
+
+class ParseResult:
+    """
+    Outcome of parsing (and optionally transforming) a single input.
+    Slots keep instances small, and pickling them as a bare tuple keeps the trip back from the workers cheap.
+    """
+    __slots__ = ("index", "parsed_successfully", "transformed_successfully", "parse_error", "transform_error",
+                 "tree_pretty", "output", "ambiguity_count", "ambiguities")
+
+    def __init__(self, index, parsed_successfully=False, transformed_successfully=False, parse_error=None,
+                 transform_error=None, tree_pretty=None, output=None, ambiguity_count=0, ambiguities=None):
+        self.index = index
+        self.parsed_successfully = parsed_successfully
+        self.transformed_successfully = transformed_successfully
+        self.parse_error = parse_error
+        self.transform_error = transform_error
+        self.tree_pretty = tree_pretty  # Pretty-printed tree, only rendered in verbose mode
+        self.output = output
+        self.ambiguity_count = ambiguity_count
+        self.ambiguities = ambiguities
+
+    def __reduce__(self):
+        # Trailing fields still at their defaults are left out, so failed parses pickle to a few values
+        values = [getattr(self, name) for name in _PARSE_RESULT_FIELDS]
+        while values and _is_default(values[-1], _PARSE_RESULT_DEFAULTS[len(values) - 1]):
+            values.pop()
+        return ParseResult, tuple(values)
+
+# __reduce__ rebuilds results as ParseResult(*values), so the field order and defaults come from __init__ itself;
+# fields without a default (such as index) get Parameter.empty, which no value matches, so they are always kept
+_PARSE_RESULT_PARAMETERS = list(inspect.signature(ParseResult.__init__).parameters.values())[1:]
+_PARSE_RESULT_FIELDS = tuple(parameter.name for parameter in _PARSE_RESULT_PARAMETERS)
+_PARSE_RESULT_DEFAULTS = tuple(parameter.default for parameter in _PARSE_RESULT_PARAMETERS)
+assert set(_PARSE_RESULT_FIELDS) == set(ParseResult.__slots__), "ParseResult.__init__ must take every slot"
+
+def _is_default(value, default):
+    # Requiring the exact type keeps transformer outputs from being asked to compare themselves,
+    # and unlike an identity check it does not rely on CPython caching small ints
+    return type(value) is type(default) and value == default
 
 def process_input(args):
     """
@@ -91,56 +214,41 @@ def process_input(args):
         args: A tuple containing (index, input_string, target)
         
     Returns:
-        A dictionary containing the results of parsing and transformation
+        A ParseResult holding the results of parsing and transformation
     """
-    global _GRAMMAR_TEXT, _START_RULE, _PARSER_TYPE, _TRANSFORMER_PATH, _AMBIGUITY_MODE, _COUNTER, _TOTAL
+    global _PARSER, _PARSER_ERROR, _TRANSFORMER, _TRANSFORMER_ERROR, _EMBED_TRANSFORMER, _AMBIGUITY_MODE, _VERBOSE
 
     i, string_and_target = args
     input_str, target = string_and_target
 
-    result = {
-        "index": i,
-        "input": input_str,
-        "parsed_successfully": False,
-        "transformed_successfully": False,
-        "parse_error": None,
-        "transform_error": None,
-        "tree_pretty": None,  # Store the pretty-printed tree as string
-        "output": None,
-        "ambiguity_count": 0,
-        "ambiguities": None
-    }
-
-    # Create parser in this process
-    try:
-        lark_kwargs = dict(start=_START_RULE, parser=_PARSER_TYPE, maybe_placeholders=False)
-        if _AMBIGUITY_MODE:
-            lark_kwargs["ambiguity"] = "explicit"
-        lark_parser = Lark(_GRAMMAR_TEXT, **lark_kwargs)
-    except Exception as e:
-        result["parse_error"] = f"Parser initialization error: {str(e)}"
-        with _COUNTER.get_lock():
-            _COUNTER.value += 1
+    result = ParseResult(i, transform_error=_TRANSFORMER_ERROR)
+
+    if _PARSER is None:
+        result.parse_error = _PARSER_ERROR
         return result
-    
-    # Create transformer in this process if needed
-    transformer = None
-    if _TRANSFORMER_PATH:
-        try:
-            transformer = load_transformer(_TRANSFORMER_PATH)
-        except Exception as e:
-            result["transform_error"] = f"Transformer initialization error: {str(e)}"
-    
+
+    # An embedded transformer runs while the input is parsed
+    lark_parser = _PARSER
+    transformer = _TRANSFORMER
+    embedded_transformer = transformer if _EMBED_TRANSFORMER else None
+
     # Parse the input
     try:
         tree = lark_parser.parse(input_str)
-        result["parsed_successfully"] = True
-        result["tree_pretty"] = tree.pretty()  # Store pretty-printed tree
+        result.parsed_successfully = True
+        if embedded_transformer is not None:
+            # The parser already returned the transformer output instead of a tree
+            result.output = tree
+            if tree == target:
+                result.transformed_successfully = True
+        elif _VERBOSE:
+            # Only verbose output shows the tree, so skip rendering and shipping it otherwise
+            result.tree_pretty = tree.pretty()
 
         # Detect ambiguities if in ambiguity mode
         if _AMBIGUITY_MODE:
             ambiguities = list(tree.find_data("_ambig"))
-            result["ambiguity_count"] = len(ambiguities)
+            result.ambiguity_count = len(ambiguities)
             if ambiguities:
                 ambig_details = []
                 for ambig_node in ambiguities:
@@ -150,36 +258,40 @@ def process_input(args):
                     ambig_details.append({
                         "num_alternatives": len(alternatives),
                         "alternative_rules": alt_names,
-                        "pretty": ambig_node.pretty()[:500]
+                        "pretty": ambig_node.pretty()[:500] if _VERBOSE else None
                     })
-                result["ambiguities"] = ambig_details
+                result.ambiguities = ambig_details
     except Exception as e:
-        result["parsed_successfully"] = False
-        result["parse_error"] = str(e)
-        with _COUNTER.get_lock():
-            _COUNTER.value += 1
+        if embedded_transformer is not None and not isinstance(e, UnexpectedInput):
+            # Grammar errors are always UnexpectedInput, so this came from a transformer callback
+            result.parsed_successfully = True
+            result.transform_error = str(e)
+        else:
+            result.parsed_successfully = False
+            result.parse_error = str(e)
         return result
     
     # Transform if needed
-    if transformer is not None and result["parsed_successfully"]:
+    if transformer is not None and embedded_transformer is None and result.parsed_successfully:
         try:
             output = transformer.transform(tree)
-            result["output"] = output
+            result.output = output
             if output == target:
-                result["transformed_successfully"] = True
+                result.transformed_successfully = True
         except Exception as e:
-            result["transform_error"] = str(e)
-    
-    # Update progress counter
-    with _COUNTER.get_lock():
-        _COUNTER.value += 1
-        current = _COUNTER.value
-        if current % 10 == 0 or current == _TOTAL.value:
-            percent = (current / _TOTAL.value) * 100
-            print(f"\rProgress: {current}/{_TOTAL.value} ({percent:.1f}%)", end="", flush=True)
-    
+            result.transform_error = str(e)
+
     return result
 
+def report_progress(current, total):
+    """
+    Print a progress line every 10 results and on the last one.
+    Results are counted in the main process as they arrive, so workers share no counter.
+    """
+    if current % 10 == 0 or current == total:
+        percent = (current / total) * 100
+        print(f"\rProgress: {current}/{total} ({percent:.1f}%)", end="", flush=True)
+
 def main():
     parser = argparse.ArgumentParser(description="Lark Grammar Parser Driver")
     parser.add_argument("--grammar_file", help="Path to the grammar file (e.g., cases/morse/grammar.lark)")
@@ -187,7 +299,8 @@ def main():
     parser.add_argument("--transformer", nargs="?", default=None, help="Import path for the transformer if required for case (e.g., cases.morse.transformer)")
     parser.add_argument("--start", default="start", help="Start symbol in the grammar (default: 'start')")
     parser.add_argument("--parser", nargs="?", choices=["earley", "lalr", "cyk"], default="earley",
-                        help="Parser algorithm to use (default: earley)")
+                        help="Parser algorithm to use (default: earley). lalr is much faster but only "
+                             "accepts LALR(1) grammars (e.g., cases/an_bn_cn) and cannot be combined with --ambiguity")
     parser.add_argument("--processes", type=int, default=None, 
                         help="Number of processes to use for parallel parsing (default: number of CPU cores)")
     parser.add_argument("--batch_size", type=int, default=None,
@@ -196,23 +309,48 @@ def main():
                         help="Print detailed output for each parsed input")
     parser.add_argument("--ambiguity", action="store_true",
                         help="Check for ambiguous parses (uses Earley explicit ambiguity mode)")
+    parser.add_argument("--no_cache", action="store_true",
+                        help="Do not cache the LALR parse tables next to the grammar file")
+    parser.add_argument("--cache_file", default=None,
+                        help="Path to cache the LALR parse tables in (default: <grammar_file>.cache)")
 
     args = parser.parse_args()
 
     # Determine number of processes to use
     num_processes = args.processes if args.processes else multiprocessing.cpu_count()
+    # Forked workers inherit the imported lark module and the parser main builds instead of re-creating them.
+    # Only fork on Linux: macOS defaults to spawn because forking after system frameworks start threads can crash
+    if sys.platform.startswith("linux"):
+        mp_context = multiprocessing.get_context("fork")
+    else:
+        mp_context = multiprocessing.get_context()
     
     grammar_text = load_grammar(args.grammar_file)
     print(f"Loaded grammar from '{args.grammar_file}' using start rule '{args.start}' with parser '{args.parser}'")
     print(f"Using {num_processes} processes for parallel parsing")
+    if args.parser == "earley" and not args.ambiguity:
+        print("Note: earley is much slower than lalr; consider --parser lalr if the grammar is LALR(1)")
+
+    # Lark can only cache the analysis of LALR grammars; it checks the grammar hash on load
+    cache_path = None
+    if args.parser == "lalr" and not args.no_cache:
+        cache_path = args.cache_file or f"{args.grammar_file}.cache"
+
+    # Lark can only run a transformer during the parse with LALR, and verbose output needs the tree
+    embed_transformer = args.transformer is not None and args.parser == "lalr" and not args.verbose
 
     # Test parser construction in the main process to catch any immediate errors
     try:
-        lark_kwargs = dict(start=args.start, parser=args.parser, maybe_placeholders=False)
         if args.ambiguity:
-            lark_kwargs["ambiguity"] = "explicit"
             print("Ambiguity detection enabled (explicit mode)")
-        lark_parser = Lark(grammar_text, **lark_kwargs)
+        # Embed the same transformer the workers will use, so this parser is reused from the build_parser cache
+        check_transformer = None
+        if embed_transformer:
+            try:
+                check_transformer = load_transformer(args.transformer)
+            except Exception:
+                pass  # Reported for each input by initialize_worker
+        build_parser(grammar_text, args.start, args.parser, args.ambiguity, cache_path, check_transformer)
         print("Parser successfully constructed.\n")
     except Exception as e:
         print("An error occurred while building the parser...")
@@ -223,35 +361,46 @@ def main():
         total_inputs = len(strings_and_targets)
         print(f"Processing {total_inputs} inputs...")
         
-        # Create shared counter for progress tracking
-        counter = Value('i', 0)
-        total_val = Value('i', total_inputs)
         
         # Prepare arguments for parallel processing - just pass indices and input/target pairs
-        process_args = [(i, strings_and_targets[i]) for i in range(total_inputs)]
+        process_args = list(enumerate(strings_and_targets))
         
         # Process in batches if requested
         batch_size = args.batch_size if args.batch_size else total_inputs
         
         start_time = time.time()
-        all_results = []
-        
-        for batch_start in range(0, total_inputs, batch_size):
-            batch_end = min(batch_start + batch_size, total_inputs)
-            batch_args = process_args[batch_start:batch_end]
-            
-            if batch_size < total_inputs:
-                print(f"\nProcessing batch {batch_start//batch_size + 1}/{(total_inputs + batch_size - 1)//batch_size}: "
-                      f"inputs {batch_start+1}-{batch_end} of {total_inputs}")
-            
-            # Process inputs in parallel with initialization
-            with Pool(
+        # Each result is stored at its input index, so the list comes out in input order
+        all_results = [None] * total_inputs
+
+        if num_processes == 1 or total_inputs < _SERIAL_THRESHOLD:
+            # Spawning workers would cost more than the parsing itself, so run in this process;
+            # initialize_worker gets the parser built above back from the build_parser cache
+            initialize_worker(grammar_text, args.start, args.parser, args.transformer, args.ambiguity, cache_path, embed_transformer, args.verbose)
+            for i, process_arg in enumerate(process_args):
+                all_results[i] = process_input(process_arg)
+                report_progress(i + 1, total_inputs)
+        else:
+            # One pool serves every batch, so workers are spawned and build their parser only once
+            completed = 0
+            with mp_context.Pool(
                 processes=num_processes,
                 initializer=initialize_worker,
-                initargs=(grammar_text, args.start, args.parser, args.transformer, args.ambiguity, counter, total_val)
+                initargs=(grammar_text, args.start, args.parser, args.transformer, args.ambiguity, cache_path, embed_transformer, args.verbose)
             ) as pool:
-                batch_results = pool.map(process_input, batch_args)
-                all_results.extend(batch_results)
+                for batch_start in range(0, total_inputs, batch_size):
+                    batch_end = min(batch_start + batch_size, total_inputs)
+                    batch_args = process_args[batch_start:batch_end]
+
+                    if batch_size < total_inputs:
+                        print(f"\nProcessing batch {batch_start//batch_size + 1}/{(total_inputs + batch_size - 1)//batch_size}: "
+                              f"inputs {batch_start+1}-{batch_end} of {total_inputs}")
+
+                    # Results carry their index, so they can be placed as they arrive in any order
+                    chunksize = max(1, len(batch_args) // (num_processes * 4))
+                    for result in pool.imap_unordered(process_input, batch_args, chunksize=chunksize):
+                        all_results[result.index] = result
+                        completed += 1
+                        report_progress(completed, total_inputs)
                 
         # Print newline after progress updates
         print("\n")
@@ -260,36 +409,33 @@ def main():
         elapsed_time = end_time - start_time
         print(f"Parsing completed in {elapsed_time:.2f} seconds")
         
-        # Sort results by index to maintain original order
-        all_results.sort(key=lambda x: x["index"])
-        
         # Display results and count successes
         count_parsed_successfully = 0
         count_transformed_successfully = 0
         
         for result in all_results:
-            if result["parsed_successfully"]:
+            if result.parsed_successfully:
                 count_parsed_successfully += 1
-                if args.transformer is not None and result["transformed_successfully"]:
+                if args.transformer is not None and result.transformed_successfully:
                     count_transformed_successfully += 1
         
         # Print detailed results if verbose mode is enabled
         if args.verbose:
             for result in all_results:
-                i = result["index"]
-                input_str = result["input"]
+                i = result.index
+                input_str = strings_and_targets[i][0]
 
                 print("-----------------------")
                 print(f"Parsing ({i+1}/{total_inputs})...")
                 print(f"\"\"\"{input_str}\"\"\"")
 
-                if result["parsed_successfully"]:
-                    print(result["tree_pretty"])  # Use the pretty-printed tree string
+                if result.parsed_successfully:
+                    print(result.tree_pretty)  # Use the pretty-printed tree string
 
                     # Show ambiguity details in verbose mode
-                    if args.ambiguity and result["ambiguity_count"] > 0:
-                        print(f"\n⚠ AMBIGUOUS: {result['ambiguity_count']} ambiguous node(s) found")
-                        for j, ambig in enumerate(result["ambiguities"]):
+                    if args.ambiguity and result.ambiguity_count > 0:
+                        print(f"\n⚠ AMBIGUOUS: {result.ambiguity_count} ambiguous node(s) found")
+                        for j, ambig in enumerate(result.ambiguities):
                             print(f"\n  Ambiguity {j+1}: {ambig['num_alternatives']} alternatives")
                             print(f"  Alternative rules: {ambig['alternative_rules']}")
                             print(f"  Parse tree branches:")
@@ -298,39 +444,39 @@ def main():
                                 print(f"    {line}")
                 else:
                     print("Error encountered during parsing...")
-                    parsing_error_message = result["parse_error"]
-                    if parsing_error_message and "Expected one of:" in parsing_error_message:
-                        split_error_message = parsing_error_message.split("Expected one of:")
-                        if len(split_error_message[1]) >= 100:
-                            print(split_error_message[0], "Expected one of:\n", split_error_message[1][0:100], "\n\t...")
-                        else:
-                            print(parsing_error_message)
+                    parsing_error_message = result.parse_error
+                    # Locate the marker once and slice around it, without copying the long token list
+                    marker_index = parsing_error_message.find(_EXPECTED_MARKER) if parsing_error_message else -1
+                    expected_start = marker_index + len(_EXPECTED_MARKER)
+                    if marker_index != -1 and len(parsing_error_message) - expected_start >= 100:
+                        print(parsing_error_message[:marker_index], f"{_EXPECTED_MARKER}\n",
+                              parsing_error_message[expected_start:expected_start + 100], "\n\t...")
                     else:
                         print(parsing_error_message)
 
-                if args.transformer is not None and result["parsed_successfully"]:
-                    if result["transform_error"] is None:
-                        output = result["output"]
+                if args.transformer is not None and result.parsed_successfully:
+                    if result.transform_error is None:
+                        output = result.output
                         target = strings_and_targets[i][1]
-                        if result["transformed_successfully"]:
+                        if result.transformed_successfully:
                             print(f"Transformer output '{output}' matches target '{target}'")
                         else:
                             print(f"Transformer output '{output}' does NOT match target '{target}'")
                     else:
                         print("Error encountered during transformation of parse tree...")
-                        print(result["transform_error"])
+                        print(result.transform_error)
 
                 print("-----------------------")
 
         # Ambiguity summary (non-verbose): list cards with ambiguities
         if args.ambiguity and not args.verbose:
-            ambiguous_cards = [(r["index"], r["ambiguity_count"], r["ambiguities"])
+            ambiguous_cards = [(r.index, r.ambiguity_count, r.ambiguities)
                                for r in all_results
-                               if r["parsed_successfully"] and r["ambiguity_count"] > 0]
+                               if r.parsed_successfully and r.ambiguity_count > 0]
             if ambiguous_cards:
                 print(f"\nAmbiguous parses detected:")
                 for idx, count, details in ambiguous_cards:
-                    input_snippet = all_results[idx]["input"][:60].replace('\n', ' ')
+                    input_snippet = strings_and_targets[idx][0][:60].replace('\n', ' ')
                     node_word = "node" if count == 1 else "nodes"
                     print(f"  Card {idx+1}: {count} ambiguous {node_word} — \"{input_snippet}...\"")
                     for j, ambig in enumerate(details):
@@ -342,8 +488,8 @@ def main():
 
         # Ambiguity totals
         if args.ambiguity:
-            total_ambiguous = sum(1 for r in all_results if r["parsed_successfully"] and r["ambiguity_count"] > 0)
-            total_ambig_nodes = sum(r["ambiguity_count"] for r in all_results if r["parsed_successfully"])
+            total_ambiguous = sum(1 for r in all_results if r.parsed_successfully and r.ambiguity_count > 0)
+            total_ambig_nodes = sum(r.ambiguity_count for r in all_results if r.parsed_successfully)
             print(f"Total cards with ambiguities: {total_ambiguous}/{count_parsed_successfully}")
             print(f"Total ambiguous nodes across all cards: {total_ambig_nodes}")
     else: